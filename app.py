@@ -6,60 +6,167 @@ Key endpoints
  • /login  – users authenticate (accounts pre‑created by admin)
  • /logout – end session
  • /setup  – per‑user wizard  → <user>/stores.json
- • /update-files – runs getCatalog.py for this user’s stores
+ • /update-files – runs getCatalog.run() for this user’s stores
  • /brands, /run – unchanged pipeline endpoints
  • /status – plain‑text progress
 """
 
-import os, sys, json, subprocess, threading, logging, time
+import os, json, threading, logging, time, shutil
+import hmac, hashlib, secrets
+from collections import OrderedDict
 from pathlib import Path
-from functools import wraps
+from functools import wraps, lru_cache
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, Future
 from dotenv import load_dotenv
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHash
 from flask import (Flask, render_template, request, jsonify,
                    redirect, url_for, abort, send_from_directory)
 from flask_login import (LoginManager, login_user, login_required,
                          logout_user, current_user, UserMixin)
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
+from markupsafe import Markup
+
+try:
+    import orjson                   # optional: faster JSON serialization
+except ImportError:
+    orjson = None
 
 # ────── basic setup ───────────────────────────────────────────
 ROOT       = Path(__file__).resolve().parent
 DATA_ROOT  = ROOT / "data"
 USERS_FILE = DATA_ROOT / "users.json"
 
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify / request.get_json backed by orjson (Rust) instead of stdlib json."""
+    def dumps(self, obj, **kw) -> str:
+        opt = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opt |= orjson.OPT_SORT_KEYS
+        if kw.get("indent"):
+            opt |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=opt).decode()
+
+    def loads(self, s, **kw):
+        return orjson.loads(s)
+
 load_dotenv()
 APP = Flask(__name__, static_folder="static", template_folder="templates")
+if orjson:
+    APP.json = ORJSONProvider(APP)
 APP.secret_key = os.getenv("SECRET_KEY", "dev‑change‑me")          # session cookie
-APP.config.update(SESSION_COOKIE_HTTPONLY=True, SESSION_COOKIE_SAMESITE="Lax")
+APP.config.update(SESSION_COOKIE_HTTPONLY=True, SESSION_COOKIE_SAMESITE="Lax",
+                  # /static fallback when no nginx front (deploy/nginx.conf)
+                  SEND_FILE_MAX_AGE_DEFAULT=3600)
 
 login_manager = LoginManager(APP)
 login_manager.login_view = "login"
 
+cache = Cache(APP, config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 30})
+
 # ────── logging ───────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO,
     format="💬 %(asctime)s | %(levelname)-7s | %(message)s")
 log = logging.getLogger("inventory‑flask")
 
+# ────── parsed‑JSON cache (mtime‑invalidated) ─────────────────
+_JSON_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
+_JSON_LOCK  = threading.Lock()
+
+def cached_json(path: Path) -> dict:
+    """
+    Return the parsed JSON at *path*, re‑reading only when its mtime/size change.
+    The returned dict is shared between requests – treat it as read‑only.
+    """
+    st  = path.stat()
+    sig = (st.st_mtime_ns, st.st_size)
+    with _JSON_LOCK:
+        hit = _JSON_CACHE.get(path)
+        if hit and hit[0] == sig:
+            return hit[1]
+    value = json.loads(path.read_text(encoding="utf-8"))
+    with _JSON_LOCK:
+        _JSON_CACHE[path] = (sig, value)
+    return value
+
+# ────── password hashing ─────────────────────────────────────
+PH = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)   # Argon2id
+
+# Legacy PBKDF2 hashes cost ~260k SHA‑256 rounds per check; remember recent
+# verdicts under a per‑process pepper so repeat attempts don't burn CPU.
+_PW_PEPPER    = secrets.token_bytes(32)
+_PW_CACHE_TTL = 300          # seconds
+_PW_CACHE_MAX = 1024
+_PW_CACHE: OrderedDict[tuple, tuple[float, bool]] = OrderedDict()
+_PW_LOCK = threading.Lock()
+
+def _check_pbkdf2_cached(username: str, pw_hash: str, raw: str) -> bool:
+    key = (username, pw_hash,
+           hmac.new(_PW_PEPPER, raw.encode("utf-8"), hashlib.sha256).digest())
+    now = time.monotonic()
+    with _PW_LOCK:
+        hit = _PW_CACHE.get(key)
+        if hit and now - hit[0] < _PW_CACHE_TTL:
+            _PW_CACHE.move_to_end(key)
+            return hit[1]
+    ok = check_password_hash(pw_hash, raw)
+    with _PW_LOCK:
+        _PW_CACHE[key] = (now, ok)
+        _PW_CACHE.move_to_end(key)
+        while len(_PW_CACHE) > _PW_CACHE_MAX:
+            _PW_CACHE.popitem(last=False)
+    return ok
+
+def script_json(obj) -> Markup:
+    """Serialize *obj* for inline <script> use (</script>‑ and quote‑safe)."""
+    txt = (orjson.dumps(obj).decode() if orjson
+           else json.dumps(obj, ensure_ascii=False))
+    return Markup(txt.replace("<", "\\u003c").replace(">", "\\u003e")
+                     .replace("&", "\\u0026").replace("'", "\\u0027"))
+
 # ────── user model & helpers ─────────────────────────────────┐
 class User(UserMixin):
     def __init__(self, uid: int, username: str, pw_hash: str):
-        self.id = uid
+        self.id = str(uid)          # Flask‑Login session ids are strings
         self.username = username
         self.pw_hash = pw_hash
 
     def check_password(self, raw: str) -> bool:
-        return check_password_hash(self.pw_hash, raw)
-
-def load_users() -> dict[str, User]:
-    if not USERS_FILE.exists():
-        log.error("🚫 users.json not found. Create it first.")
-        return {}
-    raw = json.loads(USERS_FILE.read_text())
-    return {
-        uname: User(v["id"], uname, v["password_hash"])
-        for uname, v in raw.items()
-    }
+        if self.pw_hash.startswith("$argon2"):
+            try:
+                PH.verify(self.pw_hash, raw)
+            except (VerificationError, InvalidHash):
+                return False
+            if PH.check_needs_rehash(self.pw_hash):
+                self._rehash(raw)
+            return True
+        if not _check_pbkdf2_cached(self.username, self.pw_hash, raw):   # legacy
+            return False
+        self._rehash(raw)           # move PBKDF2 accounts onto Argon2id 🆙
+        return True
 
-from werkzeug.security import generate_password_hash, check_password_hash
+    def _rehash(self, raw: str) -> None:
+        new_hash = PH.hash(raw)
+        with _USERS_LOCK:
+            data = json.loads(USERS_FILE.read_text())
+            rec  = data.get(self.username)
+            if rec is None:
+                return
+            rec["password_hash"] = new_hash
+            _save_users(USERS_FILE, data)
+        self.pw_hash = new_hash
+        log.info("🔑 Re-hashed password for user '%s' with Argon2id.", self.username)
+
+_USERS_LOCK = threading.Lock()
+
+def _save_users(db_path: Path, data: dict) -> None:
+    """Write users.json atomically (tmp file + replace)."""
+    tmp = db_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(db_path)
 
 def load_and_upgrade_users(db_path: Path) -> dict[str, dict]:
     if not db_path.exists():
@@ -71,16 +178,12 @@ def load_and_upgrade_users(db_path: Path) -> dict[str, dict]:
         # If admin provided a plain password, hash & upgrade 🆙
         if "password" in rec:
             plain = rec.pop("password")
-            rec["password_hash"] = generate_password_hash(
-                plain, method="pbkdf2:sha256", salt_length=16
-            )
+            rec["password_hash"] = PH.hash(plain)
             dirty = True
             log.info("🔑 Hashed password for user '%s' and removed plain text.", uname)
 
     if dirty:  # write the upgraded file atomically
-        tmp = db_path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
-        tmp.replace(db_path)
+        _save_users(db_path, data)
         log.info("💾 users.json upgraded with hashed passwords.")
 
     return {
@@ -89,10 +192,35 @@ def load_and_upgrade_users(db_path: Path) -> dict[str, dict]:
     }
 
 USERS = load_and_upgrade_users(USERS_FILE)
+_USERS_BY_ID = {u.id: u for u in USERS.values()}
+_USERS_SRC: dict | None = None      # cached_json() dict USERS was built from
+
+def load_users() -> dict[str, User]:
+    """
+    USERS, rebuilt whenever users.json changes on disk (via the mtime cache);
+    plain‑text entries an admin adds at runtime are hashed on the way in.
+    """
+    global USERS, _USERS_BY_ID, _USERS_SRC
+    if not USERS_FILE.exists():
+        log.error("🚫 users.json not found. Create it first.")
+        return USERS
+    raw = cached_json(USERS_FILE)
+    with _USERS_LOCK:
+        if raw is not _USERS_SRC:
+            if any("password" in rec for rec in raw.values()):
+                USERS = load_and_upgrade_users(USERS_FILE)
+                raw = cached_json(USERS_FILE)
+            else:
+                USERS = {u: User(rec["id"], u, rec["password_hash"])
+                         for u, rec in raw.items()}
+            _USERS_BY_ID = {u.id: u for u in USERS.values()}
+            _USERS_SRC = raw
+        return USERS
 
 @login_manager.user_loader
 def _load(uid: str):
-    return next((u for u in USERS.values() if str(u.id) == uid), None)
+    load_users()
+    return _USERS_BY_ID.get(uid)
 
 # ────── per‑user path helper ─────────────────────────────────┘
 def get_token_paths(tokens_dir: Path):
@@ -106,25 +234,75 @@ def get_token_paths(tokens_dir: Path):
         tokens_dir / "token_gmail.json"
     )
 
-def user_paths():
-    """Return (user_dir, csv_dir, xlsx_dir, status_file, stores_json)."""
+@dataclass(frozen=True, slots=True)
+class UserPaths:
+    udir:   Path
+    csv:    Path
+    xlsx:   Path
+    status: Path
+    stores: Path
+    tokens: Path
+
+_USER_PATHS: dict[str, UserPaths] = {}
+_USER_PATHS_LOCK = threading.Lock()
+
+def user_paths() -> UserPaths:
+    """Return the (memoized) per‑user paths; csv/ and xlsx/ are created once."""
+    up = _USER_PATHS.get(current_user.id)
+    if up is not None:
+        return up
     udir = DATA_ROOT / current_user.username
-    csv  = udir / "csv"
-    xlsx = udir / "xlsx"
-    tokens  = udir / "tokens"
-    status = udir / "last_status.txt"
-    stores = udir / "stores.json"
-    for d in (csv, xlsx):
+    up = UserPaths(
+        udir   = udir,
+        csv    = udir / "csv",
+        xlsx   = udir / "xlsx",
+        status = udir / "last_status.txt",
+        stores = udir / "stores.json",
+        tokens = udir / "tokens",
+    )
+    for d in (up.csv, up.xlsx):
         d.mkdir(parents=True, exist_ok=True)
-    return udir, csv, xlsx, status, stores, tokens
+    with _USER_PATHS_LOCK:
+        return _USER_PATHS.setdefault(current_user.id, up)
+
+# ────── background job pools ─────────────────────────────────
+PIPELINE_WORKERS = 4
+SCRAPE_WORKERS   = 2
+PIPELINE_POOL = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+SCRAPE_POOL   = ThreadPoolExecutor(max_workers=SCRAPE_WORKERS, thread_name_prefix="scrape")
+_POOL_LIMIT   = {PIPELINE_POOL: PIPELINE_WORKERS, SCRAPE_POOL: SCRAPE_WORKERS}
+SCRAPE_FANOUT = 4          # max concurrent getCatalog browsers per scrape job
+
+_JOBS: dict[str, tuple[ThreadPoolExecutor, Future]] = {}      # user id → current job
+_JOBS_LOCK = threading.Lock()
+
+def submit_job(pool: ThreadPoolExecutor, fn, status_file: Path, msg: str):
+    """
+    Queue *fn* on *pool* for the current user.  On success status_file is reset
+    to "⏳ Queued…" first, so a poller never sees the previous run's ✅/❌.
+    Returns the 202 response (carrying that X-Status-Version), else an error
+    response (409 busy user / 429 full pool).
+    """
+    with _JOBS_LOCK:
+        cur = _JOBS.get(current_user.id)
+        if cur and not cur[1].done():
+            return jsonify(ok=False, msg="A job is already running"), 409
+        running = sum(1 for p, f in _JOBS.values() if p is pool and not f.done())
+        if running >= _POOL_LIMIT[pool]:
+            return jsonify(ok=False, msg="Server busy – try again shortly"), 429
+        write_status(status_file, "⏳ Queued…")
+        ver = _status_version(status_file)
+        _JOBS[current_user.id] = (pool, pool.submit(fn))
+    return jsonify(ok=True, msg=msg), 202, {"X-Status-Version": ver}
 
 # ────── 1. AUTH ROUTES ────────────────────────────────────────
 @APP.route("/login", methods=["GET", "POST"])
+@cache.cached(timeout=300, unless=lambda: request.method == "POST")
 def login():
     if request.method == "POST":
         uname = request.form["username"]
         pw    = request.form["password"]
-        user  = USERS.get(uname)
+        user  = load_users().get(uname)
         if user and user.check_password(pw):
             login_user(user)
             (DATA_ROOT / user.username / "tokens").mkdir(parents=True, exist_ok=True)
@@ -142,23 +320,46 @@ def logout():
 @APP.route("/setup", methods=["GET"])
 @login_required
 def setup_get():
-    _, _, _, _, stores_json, _ = user_paths()
-    cfg = {"username": "", "password": "", "store_map": {}}
-    if stores_json.exists():
+    stores_json = user_paths().stores
+    mtime = stores_json.stat().st_mtime_ns if stores_json.exists() else 0
+    return _render_setup(current_user.id, mtime)
+
+@cache.memoize(30)
+def _render_setup(user_id: str, mtime: int) -> str:
+    """
+    Rendered settings page; *user_id* + stores.json *mtime* form the cache key.
+    Never contains the stored password (only a password_set flag), so the
+    cached HTML holds no credentials.
+    """
+    stores_json = user_paths().stores
+    saved = {}
+    if mtime:
         try:
-            cfg = json.loads(stores_json.read_text())
-        except json.JSONDecodeError:
+            saved = cached_json(stores_json)
+        except (FileNotFoundError, json.JSONDecodeError):
             log.warning("🛑 stores.json corrupted for %s", current_user.username)
-    return render_template("setup.html", cfg=cfg)
+    cfg = {
+        "username":     saved.get("username", ""),
+        "password_set": bool(saved.get("password")),
+        "store_map":    saved.get("store_map", {}),
+    }
+    return render_template("setup.html", cfg=cfg, cfg_json=script_json(cfg))
 
 @APP.route("/setup", methods=["POST"])
 @login_required
 def setup_post():
-    _, _, _, _, stores_json, _ = user_paths()
+    stores_json = user_paths().stores
     data = request.get_json(force=True)
+    password = data.get("password", "").strip()
+    if not password and stores_json.exists():
+        # blank field = keep the saved password (the page never receives it)
+        try:
+            password = cached_json(stores_json).get("password", "")
+        except json.JSONDecodeError:
+            pass
     cfg  = {
         "username":  data.get("username", "").strip(),
-        "password":  data.get("password", "").strip(),
+        "password":  password,
         "store_map": data.get("store_map", {}),
     }
     stores_json.write_text(json.dumps(cfg, indent=2), encoding="utf‑8")
@@ -168,7 +369,7 @@ def setup_post():
 @APP.route("/")
 @login_required
 def index():
-    _, _, _, _, stores_json, _ = user_paths()
+    stores_json = user_paths().stores
     if not stores_json.exists():
         return redirect(url_for("setup_get"))
     return render_template("index.html")
@@ -177,80 +378,200 @@ def index():
 @APP.post("/update-files")
 @login_required
 def update_files():
-    _, csv_dir, _, status_file, stores_json, tokens_dir = user_paths()
-    cfg = json.loads(stores_json.read_text())
+    up = user_paths()
+    csv_dir, status_file, stores_json = up.csv, up.status, up.stores
+    cfg = cached_json(stores_json)
 
     if not (cfg.get("username") and cfg.get("password") and cfg["store_map"]):
         return jsonify(ok=False, msg="Run setup first"), 400
 
-    for f in csv_dir.glob("*.csv"):   # clear old CSVs
-        f.unlink(missing_ok=True)
-
-    def run_store(store_name, abbr, user, pw):
-        write_status(status_file, f"⏳ Scraping {store_name} …")
-        cmd = [sys.executable, "getCatalog.py", str(csv_dir),
-               "--username", user, "--password", pw]
-        env = os.environ.copy()
-        env.update(STORE_NAME=store_name, STORE_ABBR=abbr)
-        try:
-            subprocess.check_call(cmd, cwd=ROOT, env=env)
-            write_status(status_file, f"✅ {store_name} downloaded")
-        except subprocess.CalledProcessError:
-            write_status(status_file, f"❌ Failed to download from {store_name}")
+    stores = list(cfg["store_map"].items())
+    lock   = threading.Lock()
+    stop   = threading.Event()
+    done   = 0
+
+    def fail(msg):
+        # first failure owns the status line; queued stores are skipped
+        with lock:
+            if stop.is_set():
+                return
+            stop.set()
+            write_status(status_file, msg)
+
+    def progress(msg):
+        # check + write under one lock so a late ⏳ can't overwrite fail()'s ❌
+        with lock:
+            if stop.is_set():
+                return False
+            write_status(status_file, msg)
+            return True
+
+    def run_store(idx, store_name, abbr, user, pw):
+        nonlocal done
+        if not progress(f"⏳ Scraping {store_name} …"):
             return False
+        # own download dir per store so getCatalog's "new file" diff can't race
+        dl_dir = csv_dir / f".tmp_{idx}"
+        try:
+            import getCatalog             # selenium is only needed on this path
+            dl_dir.mkdir(exist_ok=True)
+            if not getCatalog.run(str(dl_dir), user, pw, store_name, abbr):
+                fail(f"❌ Failed to download from {store_name}")
+                return False
+            for f in dl_dir.iterdir():
+                f.replace(csv_dir / f.name)
         except Exception as e:
-            write_status(status_file, f"❌ Unexpected error: {e}")
+            fail(f"❌ Unexpected error: {e}")
             return False
+        finally:
+            shutil.rmtree(dl_dir, ignore_errors=True)
+        with lock:
+            done += 1
+            n = done
+        progress(f"⏳ {store_name} downloaded ({n}/{len(stores)})")
         return True
 
     def worker():
-        for sname, abbr in cfg["store_map"].items():
-            success = run_store(sname, abbr, cfg["username"], cfg["password"])
-            if not success:
-                break
-        else:
-            write_status(status_file, "✅ All stores done")
-
-    threading.Thread(target=worker, daemon=True).start()
-    return jsonify(ok=True, msg="Scrape started"), 202
+        try:
+            with os.scandir(csv_dir) as it:   # clear old CSVs
+                for e in it:
+                    if e.name.endswith(".csv"):
+                        try:
+                            os.unlink(e.path)
+                        except FileNotFoundError:
+                            pass
+            with ThreadPoolExecutor(max_workers=min(len(stores), SCRAPE_FANOUT),
+                                    thread_name_prefix="store") as ex:
+                results = list(ex.map(
+                    lambda a: run_store(*a, cfg["username"], cfg["password"]),
+                    ((i, sname, abbr) for i, (sname, abbr) in enumerate(stores))))
+            if all(results):
+                _BRANDS_CACHE.pop(csv_dir, None)
+                write_status(status_file, "✅ All stores done")
+        except Exception as e:
+            log.exception("🔥 Scrape failed for %s", up.udir.name)
+            write_status(status_file, "❌ Scrape error: " + str(e))
+
+    return submit_job(SCRAPE_POOL, worker, status_file, "Scrape started")
 # ────── 5. BRANDS & PIPELINE ──────────────────────────────────
-from inventory_core import scan_brands, run_full_pipeline
+@lru_cache(maxsize=1)
+def _core():
+    """Import inventory_core (pandas, openpyxl, Google APIs) on first use only."""
+    from inventory_core import scan_brands, run_full_pipeline
+    return scan_brands, run_full_pipeline
+
+_BRANDS_CACHE: dict[Path, tuple[tuple, list]] = {}
+
+def _csv_signature(csv_dir: Path) -> tuple:
+    """(name, mtime_ns) of every CSV – changes on add, remove or rewrite."""
+    with os.scandir(csv_dir) as it:
+        return tuple(sorted((e.name, e.stat().st_mtime_ns)
+                            for e in it if e.name.lower().endswith(".csv")))
 
 @APP.get("/brands")
 @login_required
 def brands():
-    _, csv_dir, _, _, _, _ = user_paths()
+    csv_dir = user_paths().csv
+    sig = _csv_signature(csv_dir)
+    hit = _BRANDS_CACHE.get(csv_dir)
+    if hit and hit[0] == sig:
+        return jsonify(hit[1])
+    scan_brands, _ = _core()
     lst = scan_brands(csv_dir)
+    _BRANDS_CACHE[csv_dir] = (sig, lst)
     log.info("🔍 %s → %d brands", current_user.username, len(lst))
     return jsonify(lst)
 
 @APP.post("/run")
 @login_required
 def run_pipeline():
-    _, csv_dir, xlsx_dir, status_file, _, tokens_dir = user_paths()
+    up = user_paths()
+    csv_dir, xlsx_dir, status_file, tokens_dir = up.csv, up.xlsx, up.status, up.tokens
     data = request.get_json(force=True)
 
     def bg():
         try:
-            st = run_full_pipeline(csv_dir, xlsx_dir, data["brands"], data["emails"], tokens_dir, status_file)
+            _, run_full_pipeline = _core()
+            st = run_full_pipeline(csv_dir, xlsx_dir, data["brands"], data["emails"], tokens_dir,
+                                   lambda txt: write_status(status_file, txt))
 
             write_status(status_file,
                 ("✅ " if st["ok"] else "❌ ") + st["msg"])
         except Exception as e:
+            log.exception("🔥 Pipeline failed for %s", up.udir.name)
             write_status(status_file, "❌ Pipeline error: " + str(e))
-    threading.Thread(target=bg, daemon=True).start()
-    return jsonify(ok=True, msg="Pipeline started"), 202
+    return submit_job(PIPELINE_POOL, bg, status_file, "Pipeline started")
+
+STATUS_LONGPOLL_S   = 25
+# Each held poll pins a server thread (wsgi.py runs 16): past this many,
+# answer 204 + Retry-After at once so login & friends keep threads free.
+STATUS_LONGPOLL_MAX = 8
+_STATUS_COND  = threading.Condition()           # notified by write_status()
+_LONGPOLL_SEM = threading.BoundedSemaphore(STATUS_LONGPOLL_MAX)
+
+def _status_version(path: Path) -> str:
+    """Opaque change token: os.replace() gives every write a new inode."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return "0"
+    return f"{st.st_mtime_ns:x}-{st.st_ino:x}"
 
 @APP.get("/status")
 @login_required
 def status():
-    _,_, _, status_file, _, _ = user_paths()
-    return (status_file.read_text(encoding="utf-8") if status_file.exists() else "No status.")
+    """
+    Plain‑text progress.  Plain GET → ETag/304 revalidation.
+    GET ?since=<X-Status-Version> → long‑poll: block until the file changes
+    (or STATUS_LONGPOLL_S passes → empty 204).
+    """
+    status_file = user_paths().status
+    since = request.args.get("since")
+    if since is not None and _status_version(status_file) == since:
+        if not _LONGPOLL_SEM.acquire(blocking=False):
+            return "", 204, {"X-Status-Version": since, "Retry-After": "2"}
+        try:
+            deadline = time.monotonic() + STATUS_LONGPOLL_S
+            with _STATUS_COND:
+                while (ver := _status_version(status_file)) == since:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        return "", 204, {"X-Status-Version": ver}
+                    _STATUS_COND.wait(left)         # write_status() notifies
+        finally:
+            _LONGPOLL_SEM.release()
+    try:
+        st = status_file.stat()
+    except FileNotFoundError:
+        return "No status.", 200, {"X-Status-Version": "0"}
+    # unchanged since the last poll → header‑only 304, no file read
+    tag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    ver = f"{st.st_mtime_ns:x}-{st.st_ino:x}"
+    if request.if_none_match.contains_weak(tag):
+        return "", 304, {"ETag": f'W/"{tag}"', "X-Status-Version": ver}
+    rv = send_from_directory(status_file.parent, status_file.name,
+                             mimetype="text/plain",
+                             etag=False, last_modified=st.st_mtime,
+                             conditional=False)
+    rv.set_etag(tag, weak=True)
+    rv.headers["X-Status-Version"] = ver
+    return rv
 
 # ────── util ────────────────────────────────────────────
 def write_status(path: Path, txt: str):
-    path.write_text(txt, encoding="utf-8")
+    """Atomically replace *path* so /status never sees a half‑written file."""
+    data = txt.encode("utf-8")
+    tmp  = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")   # per‑thread
+    fd   = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+    with _STATUS_COND:
+        _STATUS_COND.notify_all()
 
 # ────── run ─────────────────────────────────────────────
+# Dev server only – deploy through wsgi.py (gunicorn / uvicorn).
 if __name__ == "__main__":
     APP.run(port=5000, threaded=True)
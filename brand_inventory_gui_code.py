@@ -13,7 +13,7 @@ GUI that:
 5) Sends an HTML email with each brand's public Drive folder link to the specified recipients.
 
 Packages needed:
- - pandas, openpyxl
+ - pandas, openpyxl, xlsxwriter (pyarrow optional: faster CSV parsing)
  - google-auth, google-auth-oauthlib, google-api-python-client
  - credentials.json for Google OAuth (Drive + Gmail)
  - token_drive.json, token_gmail.json are created automatically after first login.
@@ -22,15 +22,20 @@ Packages needed:
 
 import os
 import re
+import csv
+import html
 import shutil
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import pandas as pd
 import traceback
 from datetime import datetime
-import subprocess
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 # For Excel formatting
+import xlsxwriter
 from openpyxl import load_workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
@@ -65,6 +70,16 @@ def get_token_paths(base_folder):
 # Google Drive API Scopes
 DRIVE_SCOPES = ["https://www.googleapis.com/auth/drive.file"]
 
+# Concurrent XLSX uploads (Drive allows ~10 writes/s/user)
+DRIVE_UPLOAD_WORKERS = 8
+
+# Max sub-requests per Drive BatchHttpRequest
+DRIVE_BATCH_SIZE = 100
+
+# Files under this size go up in a single request; larger ones resumable in big chunks
+DRIVE_SIMPLE_UPLOAD_MAX = 5 * 1024 * 1024
+DRIVE_UPLOAD_CHUNK = 8 * 1024 * 1024
+
 # Gmail API Scopes
 GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 
@@ -75,6 +90,22 @@ OPTIONAL_COLUMNS = ["Category", "Cost"]
 # We'll consider Available <= 2 => "Unavailable"
 MAX_AVAIL_FOR_UNAVAILABLE = 2
 
+# Rows dropped from reports (compiled once, reused for every CSV)
+_SAMPLE_PROMO_RE = re.compile(r"\bsample\b|\bpromo\b", re.IGNORECASE)
+
+# Report styles: xlsxwriter format properties for the streaming writer ...
+_HEADER_FORMAT = {"bold": True, "bg_color": "#D3D3D3", "pattern": 1,
+                  "align": "center", "valign": "vcenter"}
+_CAT_FORMAT    = {"bold": True, "font_size": 14, "bg_color": "#E6E6FA", "pattern": 1,
+                  "align": "center", "valign": "vcenter"}
+# ... and the openpyxl equivalents for advanced_format_excel() on existing files
+# (colors are full ARGB: a 6-digit hex gets alpha 00, i.e. a transparent fill)
+_HEADER_FONT  = Font(bold=True)
+_HEADER_FILL  = PatternFill(start_color="FFD3D3D3", end_color="FFD3D3D3", fill_type="solid")
+_HEADER_ALIGN = Alignment(horizontal='center', vertical='center')
+_CAT_FONT     = Font(bold=True, size=14)
+_CAT_FILL     = PatternFill(start_color="FFE6E6FA", end_color="FFE6E6FA", fill_type="solid")
+
 # ----------------------------------------------------------------------
 #                  CONFIG.TXT load/save
 # ----------------------------------------------------------------------
@@ -107,9 +138,53 @@ def save_config(input_dir, output_dir):
 # ----------------------------------------------------------------------
 #                  GOOGLE DRIVE / GMAIL AUTH
 # ----------------------------------------------------------------------
-def drive_authenticate(base_folder):
-    creds = None
+# Credentials and built API clients are reused across runs, both keyed on the
+# token file's path + mtime so a fresh login replaces the old entry. Each token
+# file has its own lock (one user's interactive OAuth never blocks another's),
+# and clients are kept per thread because httplib2 isn't thread-safe. Expired
+# tokens refresh themselves on the next request.
+_CREDS_CACHE = {}                     # token_path -> (mtime_ns, creds)
+_TOKEN_LOCKS = {}                     # token_path -> Lock
+_TOKEN_LOCKS_GUARD = threading.Lock()
+_SERVICES = threading.local()
+
+def _token_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _token_lock(token_path):
+    with _TOKEN_LOCKS_GUARD:
+        return _TOKEN_LOCKS.setdefault(token_path, threading.Lock())
+
+def _cached_credentials(token_path, load):
+    with _token_lock(token_path):
+        hit = _CREDS_CACHE.get(token_path)
+        if hit and hit[0] == _token_mtime(token_path):
+            return hit[1]
+        creds = load()
+        _CREDS_CACHE[token_path] = (_token_mtime(token_path), creds)
+        return creds
+
+def _cached_service(api, version, token_path, creds):
+    """This thread's client for (api, token_path), rebuilt when the token file changes."""
+    services = _SERVICES.__dict__.setdefault("by_token", {})
+    sig = _token_mtime(token_path)
+    hit = services.get((api, token_path))
+    if hit and hit[0] == sig:
+        return hit[1]
+    svc = build(api, version, credentials=creds, cache_discovery=False)
+    services[(api, token_path)] = (sig, svc)
+    return svc
+
+def drive_credentials(base_folder):
+    """Load/refresh (or interactively create) the user's Drive OAuth credentials."""
     token_drive, _ = get_token_paths(base_folder)
+    return _cached_credentials(token_drive, lambda: _load_drive_credentials(token_drive))
+
+def _load_drive_credentials(token_drive):
+    creds = None
 
     if os.path.exists(token_drive):
         creds = Credentials.from_authorized_user_file(token_drive, DRIVE_SCOPES)
@@ -124,12 +199,20 @@ def drive_authenticate(base_folder):
         with open(token_drive, "w") as token:
             token.write(creds.to_json())
 
-    return build("drive", "v3", credentials=creds)
+    return creds
 
 
-def gmail_authenticate(base_folder):
-    creds = None
+def drive_authenticate(base_folder):
+    token_drive, _ = get_token_paths(base_folder)
+    return _cached_service("drive", "v3", token_drive, drive_credentials(base_folder))
+
+
+def gmail_credentials(base_folder):
     _, token_gmail = get_token_paths(base_folder)
+    return _cached_credentials(token_gmail, lambda: _load_gmail_credentials(token_gmail))
+
+def _load_gmail_credentials(token_gmail):
+    creds = None
 
     if os.path.exists(token_gmail):
         creds = Credentials.from_authorized_user_file(token_gmail, GMAIL_SCOPES)
@@ -143,7 +226,12 @@ def gmail_authenticate(base_folder):
         with open(token_gmail, "w") as f:
             f.write(creds.to_json())
 
-    return build("gmail", "v1", credentials=creds)
+    return creds
+
+
+def gmail_authenticate(base_folder):
+    _, token_gmail = get_token_paths(base_folder)
+    return _cached_service("gmail", "v1", token_gmail, gmail_credentials(base_folder))
 
 
 def make_folder_public(drive_service, folder_id):
@@ -151,12 +239,23 @@ def make_folder_public(drive_service, folder_id):
     permission = {"type": "anyone", "role": "reader"}
     drive_service.permissions().create(fileId=folder_id, body=permission).execute()
 
-def find_or_create_folder(drive_service, folder_name, parent_id=None, make_public=False):
+def find_or_create_folder(drive_service, folder_name, parent_id=None, make_public=False, cache=None):
     """
     Find or create a folder named folder_name under parent_id.
     If newly created and make_public=True, sets public read permission.
-    Returns folder_id or None on error.
+    Returns folder_id or None on error. Pass the same *cache* dict for the
+    length of one upload run to skip repeat lookups (IDs aren't kept longer:
+    a folder trashed in Drive would otherwise keep resolving to a dead ID).
     """
+    key = (folder_name, parent_id)
+    if cache is not None and key in cache:
+        return cache[key]
+    fid = _find_or_create_folder(drive_service, folder_name, parent_id, make_public)
+    if fid and cache is not None:
+        cache[key] = fid
+    return fid
+
+def _find_or_create_folder(drive_service, folder_name, parent_id, make_public):
     from googleapiclient.errors import HttpError
     folder_name_escaped = folder_name.replace("'", "\\'")
     q = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name_escaped}'"
@@ -192,12 +291,88 @@ def find_or_create_folder(drive_service, folder_name, parent_id=None, make_publi
 
     return fid
 
+def find_or_create_folders(drive_service, folder_names, parent_id, make_public=False, cache=None):
+    """
+    Batched find_or_create_folder() for many folder_names under one parent_id:
+    a single (paged) files().list for the existing children, then the missing
+    folders (and their public permissions) created via BatchHttpRequest.
+    Returns {folder_name: folder_id}; names that could not be created are omitted.
+    """
+    from googleapiclient.errors import HttpError
+    q = f"mimeType='application/vnd.google-apps.folder' and '{parent_id}' in parents"
+    existing, page_token = {}, None
+    try:
+        while True:
+            res = drive_service.files().list(
+                q=q, spaces="drive", pageSize=1000, pageToken=page_token,
+                fields="nextPageToken, files(id, name)",
+            ).execute()
+            for f in res.get("files", []):
+                existing.setdefault(f["name"], f["id"])
+            page_token = res.get("nextPageToken")
+            if not page_token:
+                break
+    except HttpError as e:
+        print(f"[ERROR] find_or_create_folders: {e}")
+        return {}
+
+    wanted = list(dict.fromkeys(folder_names))
+    missing = [n for n in wanted if n not in existing]
+    created = {}
+
+    def on_create(request_id, response, exception):
+        name = missing[int(request_id)]
+        if exception is not None:
+            print(f"[ERROR] Could not create folder '{name}': {exception}")
+            return
+        created[name] = response["id"]
+        print(f"[INFO] Created new folder '{name}' (ID: {response['id']})")
+
+    def on_permission(request_id, response, exception):
+        if exception is not None:
+            print(f"[ERROR] Could not make folder public: {exception}")
+
+    for start in range(0, len(missing), DRIVE_BATCH_SIZE):
+        batch = drive_service.new_batch_http_request(callback=on_create)
+        for i in range(start, min(start + DRIVE_BATCH_SIZE, len(missing))):
+            meta = {
+                "name": missing[i],
+                "mimeType": "application/vnd.google-apps.folder",
+                "parents": [parent_id],
+            }
+            batch.add(drive_service.files().create(body=meta, fields="id"), request_id=str(i))
+        batch.execute()
+
+    if make_public and created:
+        permission = {"type": "anyone", "role": "reader"}
+        new_ids = list(created.values())
+        for start in range(0, len(new_ids), DRIVE_BATCH_SIZE):
+            batch = drive_service.new_batch_http_request(callback=on_permission)
+            for fid in new_ids[start:start + DRIVE_BATCH_SIZE]:
+                batch.add(drive_service.permissions().create(fileId=fid, body=permission))
+            batch.execute()
+
+    existing.update(created)
+    resolved = {n: existing[n] for n in wanted if n in existing}
+    if cache is not None:
+        cache.update(((n, parent_id), fid) for n, fid in resolved.items())
+    return resolved
+
 def upload_file_to_drive(drive_service, file_path, parent_id):
     """Upload a local file to the given parent folder ID. Return the uploaded file ID."""
     file_name = os.path.basename(file_path)
     meta = {"name": file_name, "parents": [parent_id]}
-    media = MediaFileUpload(file_path, resumable=True)
-    uploaded = drive_service.files().create(body=meta, media_body=media, fields="id").execute()
+    if os.path.getsize(file_path) < DRIVE_SIMPLE_UPLOAD_MAX:
+        # Small report: one multipart POST instead of a resumable session
+        media = MediaFileUpload(file_path, resumable=False)
+        uploaded = drive_service.files().create(body=meta, media_body=media, fields="id").execute(num_retries=5)
+        return uploaded.get("id")
+
+    media = MediaFileUpload(file_path, resumable=True, chunksize=DRIVE_UPLOAD_CHUNK)
+    request = drive_service.files().create(body=meta, media_body=media, fields="id")
+    uploaded = None
+    while uploaded is None:
+        _, uploaded = request.next_chunk(num_retries=5)
     return uploaded.get("id")
 
 def send_email_with_gmail_html(subject, html_body, recipients, base_folder):
@@ -237,12 +412,10 @@ def advanced_format_excel(xlsx_path):
         ws.freeze_panes = "A2"
 
         # Header style
-        header_font = Font(bold=True)
-        header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
         for cell in ws[1]:
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.fill = header_fill
+            cell.font = _HEADER_FONT
+            cell.alignment = _HEADER_ALIGN
+            cell.fill = _HEADER_FILL
 
         # Auto-fit columns
         for col in ws.columns:
@@ -263,45 +436,73 @@ def advanced_format_excel(xlsx_path):
                 category_index = i
                 break
         if category_index:
-            rows_data = list(ws.iter_rows(min_row=2, values_only=True))
-            if rows_data:
-                current_cat = None
-                insert_positions = []
-                row_num = 2
-                for row_vals in rows_data:
-                    cat_val = row_vals[category_index - 1]
-                    if cat_val != current_cat:
-                        if current_cat is not None:
-                            insert_positions.append(row_num)
-                        current_cat = cat_val
-                    row_num += 1
-                # Insert at the very top
-                insert_positions.insert(0, 2)
-
-                cat_font = Font(bold=True, size=14)
-                cat_fill = PatternFill(start_color="E6E6FA", end_color="E6E6FA", fill_type="solid")
-
-                # We'll also need the cat value
-                row_num = 2
-                cat_list = []
-                cur_cat = None
-                for row_vals in rows_data:
-                    cat_val = row_vals[category_index - 1]
-                    if cat_val != cur_cat:
-                        cat_list.append((row_num, cat_val))
-                        cur_cat = cat_val
-                    row_num += 1
-
-                # Insert from bottom to top
-                for (pos, cat_val) in reversed(cat_list):
-                    ws.insert_rows(pos, 1)
-                    c = ws.cell(row=pos, column=1)
-                    c.value = str(cat_val)
-                    c.font = cat_font
-                    c.fill = cat_fill
-                    c.alignment = Alignment(horizontal='center', vertical='center')
+            # One pass: (row, value) wherever the category changes
+            cat_list = []
+            cur_cat = None
+            for row_num, (cat_val,) in enumerate(
+                    ws.iter_rows(min_row=2, min_col=category_index,
+                                 max_col=category_index, values_only=True), start=2):
+                if cat_val != cur_cat:
+                    cat_list.append((row_num, cat_val))
+                    cur_cat = cat_val
+
+            # Open the gaps bottom-up: the k-th group moves down k+1 rows, so every
+            # row is moved once (O(N)) instead of one insert_rows per category
+            last_col = get_column_letter(ws.max_column)
+            seg_ends = [pos - 1 for pos, _ in cat_list[1:]] + [ws.max_row]
+            for k in range(len(cat_list) - 1, -1, -1):
+                pos, cat_val = cat_list[k]
+                ws.move_range(f"A{pos}:{last_col}{seg_ends[k]}", rows=k + 1)
+                c = ws.cell(row=pos + k, column=1)
+                c.value = str(cat_val)
+                c.font = _CAT_FONT
+                c.fill = _CAT_FILL
+                c.alignment = _HEADER_ALIGN
     wb.save(xlsx_path)
 
+def new_report_workbook(path):
+    """xlsxwriter workbook that streams rows to disk (constant_memory) as they're written."""
+    return xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "strings_to_formulas": False,   # CSV text is data, never a formula
+        "strings_to_urls": False,
+    })
+
+def write_report_sheet(wb, title, df):
+    """
+    Stream *df* into a new sheet of xlsxwriter workbook *wb*, producing the same
+    layout as advanced_format_excel() in a single pass (no reload / insert_rows):
+    frozen header, bold grey headers, auto-fit columns, 'Category' group rows.
+    """
+    header_fmt = wb.add_format(_HEADER_FORMAT)
+    cat_fmt    = wb.add_format(_CAT_FORMAT)
+    ws = wb.add_worksheet(title)
+    ws.freeze_panes(1, 0)
+
+    cols  = [str(c) for c in df.columns]
+    frame = df.astype(object).where(df.notna(), None)
+
+    # Auto-fit columns from vectorized string lengths (set before the first row)
+    for i, (name, col) in enumerate(zip(cols, frame.columns)):
+        lens = frame[col].dropna().astype(str).str.len()
+        width = max(len(name), int(lens.max()) if len(lens) else 0)
+        ws.set_column(i, i, width + 3)
+
+    ws.write_row(0, 0, cols, header_fmt)
+
+    # Emit a group row whenever 'Category' changes
+    category_index = next((i for i, c in enumerate(cols) if c.lower() == "category"), None)
+    cur_cat = None
+    r = 1
+    for row_vals in frame.itertuples(index=False, name=None):
+        if category_index is not None and row_vals[category_index] != cur_cat:
+            cur_cat = row_vals[category_index]
+            ws.write_string(r, 0, str(cur_cat), cat_fmt)
+            r += 1
+        ws.write_row(r, 0, row_vals)
+        r += 1
+    return ws
+
 def extract_strain_type(product_name):
     """Optional: parse 'S', 'H', 'I' from product name, if you want to track strain."""
     if not isinstance(product_name, str):
@@ -315,6 +516,79 @@ def extract_strain_type(product_name):
         return "I"
     return ""
 
+def list_csv_files(folder):
+    """Paths of the *.csv files directly in folder (one scandir pass, no extra stat)."""
+    with os.scandir(folder) as it:
+        return [e.path for e in it if e.is_file() and e.name.lower().endswith(".csv")]
+
+def csv_has_column(csv_path, column):
+    """Peek at the CSV header row only; True if *column* is one of its fields."""
+    with open(csv_path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        header = next(csv.reader(f), [])
+    return column in header
+
+def extract_strain_types(products):
+    """
+    Vectorized extract_strain_type() over a Series of product names.
+    Same precedence (S, then H, then I); non-string entries map to "".
+    """
+    out = pd.Series("", index=products.index, dtype=object)
+    if not (pd.api.types.is_object_dtype(products) or pd.api.types.is_string_dtype(products)):
+        return out
+    upper = products.str.upper()
+    for code in ("I", "H", "S"):  # lowest precedence first; later codes overwrite
+        out[upper.str.contains(rf"\b{code}\b", na=False).to_numpy(dtype=bool)] = code
+    return out
+
+def read_report_csv(csv_path):
+    """
+    Read only the report columns (REQUIRED + OPTIONAL) of csv_path, using the
+    multithreaded pyarrow parser when available and the C engine otherwise.
+    """
+    with open(csv_path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        header = next(csv.reader(f), [])
+    usecols = [c for c in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if c in header]
+    if not usecols:
+        return pd.DataFrame(columns=header)
+    try:
+        return pd.read_csv(csv_path, usecols=usecols, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(csv_path, usecols=usecols)
+
+def read_brand_values(csv_path, max_rows=50000):
+    """
+    Unique lowercased/stripped Brand values from the first max_rows of csv_path.
+    Streams just that column through pyarrow's CSV reader + compute kernels
+    when available (no DataFrame built); falls back to pandas otherwise.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        df = pd.read_csv(csv_path, nrows=max_rows,
+                         usecols=lambda c: c == "Brand",
+                         dtype={"Brand": "string"},
+                         engine="c", on_bad_lines="skip")
+        return set(df["Brand"].dropna().str.strip().str.lower().unique().tolist())
+
+    reader = pa_csv.open_csv(
+        csv_path,
+        parse_options=pa_csv.ParseOptions(invalid_row_handler=lambda row: "skip"),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=["Brand"], column_types={"Brand": pa.string()},
+            strings_can_be_null=True,  # "", "NA", "null"… are missing, as in pandas
+        ),
+    )
+    brands, seen = set(), 0
+    for batch in reader:
+        col = batch.column(0).slice(0, max_rows - seen)
+        seen += len(col)
+        brands.update(pc.unique(pc.utf8_lower(pc.utf8_trim_whitespace(col.drop_null()))).to_pylist())
+        if seen >= max_rows:
+            break
+    return brands
+
 # ----------------- CSV -> XLSX: Avail + Unavail -----------------
 def generate_brand_reports(csv_path, out_dir, selected_brands):
     """
@@ -327,7 +601,7 @@ def generate_brand_reports(csv_path, out_dir, selected_brands):
     Returns { brand_lower: [list_of_xlsx_paths] } for each brand found.
     """
     try:
-        df = pd.read_csv(csv_path)
+        df = read_report_csv(csv_path)
     except Exception as e:
         print(f"[ERROR] reading {csv_path}: {e}")
         return {}
@@ -340,9 +614,20 @@ def generate_brand_reports(csv_path, out_dir, selected_brands):
 
     df = df[keep_cols]
 
+    # Lowercase + strip brand once for consistent matching; categorical so
+    # isin/groupby/equality below work on integer codes
+    if "Brand" in df.columns:
+        df = df.assign(Brand=df["Brand"].astype(str).str.strip().str.lower().astype("category"))
+
+    # Brand filter first: everything below (sample/promo regex, split, sort,
+    # per-brand groupby) then only touches the selected brands' rows
+    if selected_brands and "Brand" in df.columns:
+        selected_lower = [b.strip().lower() for b in selected_brands]
+        df = df[df["Brand"].isin(selected_lower)]
+
     # Remove "sample"/"promo" lines
     if "Product" in df.columns:
-        df = df[~df["Product"].str.contains(r"(?i)\bsample\b|\bpromo\b", na=False)]
+        df = df[~df["Product"].str.contains(_SAMPLE_PROMO_RE, na=False)]
 
     # Split into available/unavailable
     unavailable_df = df[df["Available"] <= MAX_AVAIL_FOR_UNAVAILABLE]
@@ -352,16 +637,6 @@ def generate_brand_reports(csv_path, out_dir, selected_brands):
         print(f"[INFO] No brand data or empty after filtering in '{csv_path}'")
         return {}
 
-    # Lowercase + strip brand for consistent matching
-    available_df.loc[:, "Brand"] = available_df["Brand"].astype(str).str.strip().str.lower()
-
-
-    # If user selected brand(s), also convert them to lowercase
-    if selected_brands:
-        # Turn each user brand into a lowercased version
-        selected_lower = [b.strip().lower() for b in selected_brands]
-        available_df = available_df[available_df["Brand"].isin(selected_lower)]
-
     # If nothing remains:
     if available_df.empty:
         print(f"[INFO] No matching brand data in '{csv_path}' after brand filter.")
@@ -369,7 +644,7 @@ def generate_brand_reports(csv_path, out_dir, selected_brands):
 
     # Example: add "Strain_Type"
     if "Product" in available_df.columns:
-        available_df["Strain_Type"] = available_df["Product"].apply(extract_strain_type)
+        available_df["Strain_Type"] = extract_strain_types(available_df["Product"])
 
     # Sort
     sort_cols = []
@@ -389,10 +664,6 @@ def generate_brand_reports(csv_path, out_dir, selected_brands):
     if "Cost" in unavailable_df.columns:
         unavailable_df = unavailable_df.drop(columns=["Cost"])
 
-    # Also normalize brand in the unavailable set
-    if "Brand" in unavailable_df.columns and not unavailable_df.empty:
-        unavailable_df.loc[:, "Brand"] = unavailable_df["Brand"].astype(str).str.strip().str.lower()
-
     os.makedirs(out_dir, exist_ok=True)
     base_csv_name = os.path.splitext(os.path.basename(csv_path))[0]
     parts = base_csv_name.split("_")
@@ -401,22 +672,24 @@ def generate_brand_reports(csv_path, out_dir, selected_brands):
 
     # Group the *available* portion by brand
     brand_map = {}
-    for brand_name_lower, brand_data in available_df.groupby("Brand"):
+    # Pre-split the "Unavailable" rows once: O(N + B) instead of a scan per brand
+    unavail_by_brand = (
+        dict(tuple(unavailable_df.groupby("Brand", observed=True, sort=False)))
+        if not unavailable_df.empty else {}
+    )
+    for brand_name_lower, brand_data in available_df.groupby("Brand", observed=True):
         # Grab the "Unavailable" rows for that brand
-        brand_unavail = pd.DataFrame()
-        if not unavailable_df.empty:
-            brand_unavail = unavailable_df[unavailable_df["Brand"] == brand_name_lower]
+        brand_unavail = unavail_by_brand.get(brand_name_lower, pd.DataFrame())
 
         dt_str = datetime.now().strftime("%m-%d-%Y")
         out_name = f"{store_abbr}_{brand_name_lower}_{dt_str}.xlsx"
         out_path = os.path.join(out_dir, out_name)
 
-        with pd.ExcelWriter(out_path, engine="openpyxl") as writer:
-            brand_data.to_excel(writer, index=False, sheet_name="Available")
-            if not brand_unavail.empty:
-                brand_unavail.to_excel(writer, index=False, sheet_name="Unavailable")
-
-        advanced_format_excel(out_path)
+        wb = new_report_workbook(out_path)
+        write_report_sheet(wb, "Available", brand_data)
+        if not brand_unavail.empty:
+            write_report_sheet(wb, "Unavailable", brand_unavail)
+        wb.close()
 
         if brand_name_lower not in brand_map:
             brand_map[brand_name_lower] = []
@@ -435,35 +708,52 @@ def upload_brand_reports_to_drive(brand_reports_map, base_folder):
     Return: { brand_name_lower: "https://drive.google.com/drive/folders/<id>"}
     """
     os.makedirs(base_folder, exist_ok=True) 
-    drive_svc = drive_authenticate(base_folder)
-    top_id = find_or_create_folder(drive_svc, DRIVE_PARENT_FOLDER_NAME)
+    token_drive, _ = get_token_paths(base_folder)
+    creds = drive_credentials(base_folder)
+    drive_svc = _cached_service("drive", "v3", token_drive, creds)
+    folder_cache = {}  # (name, parent_id) -> id, for this run only
+    top_id = find_or_create_folder(drive_svc, DRIVE_PARENT_FOLDER_NAME, cache=folder_cache)
     if not top_id:
         print("[ERROR] Could not find/create top-level folder. Aborting.")
         return {}
 
     date_str = datetime.now().strftime("%Y-%m-%d")
-    date_id = find_or_create_folder(drive_svc, date_str, parent_id=top_id)
+    date_id = find_or_create_folder(drive_svc, date_str, parent_id=top_id, cache=folder_cache)
     if not date_id:
         print("[ERROR] Could not create/find date subfolder. Aborting.")
         return {}
 
-    brand_links = {}
-    for brand_lower, xlsx_list in brand_reports_map.items():
-        brand_id = find_or_create_folder(drive_svc, brand_lower, parent_id=date_id, make_public=True)
-        if not brand_id:
-            print(f"[ERROR] Could not create folder for {brand_lower}")
-            continue
+    # httplib2 isn't thread-safe: one Drive service per upload thread, shared creds
+    def upload_worker(xfile, brand_id):
+        return upload_file_to_drive(_cached_service("drive", "v3", token_drive, creds), xfile, brand_id)
 
-        for xfile in xlsx_list:
+    # All brand folders resolved in one list call + batched creates
+    brand_ids = find_or_create_folders(drive_svc, list(brand_reports_map), date_id,
+                                       make_public=True, cache=folder_cache)
+
+    brand_links = {}
+    with ThreadPoolExecutor(max_workers=DRIVE_UPLOAD_WORKERS) as ex:
+        futures = {}
+        for brand_lower, xlsx_list in brand_reports_map.items():
+            brand_id = brand_ids.get(brand_lower)
+            if not brand_id:
+                print(f"[ERROR] Could not create folder for {brand_lower}")
+                continue
+
+            for xfile in xlsx_list:
+                futures[ex.submit(upload_worker, xfile, brand_id)] = (xfile, brand_lower)
+
+            link = f"https://drive.google.com/drive/folders/{brand_id}"
+            brand_links[brand_lower] = link
+
+        for fut in as_completed(futures):
+            xfile, brand_lower = futures[fut]
             try:
-                upload_file_to_drive(drive_svc, xfile, brand_id)
+                fut.result()
                 print(f"[DRIVE] Uploaded {os.path.basename(xfile)} => {brand_lower}")
             except Exception as e:
                 print(f"[ERROR] Uploading {xfile} => {brand_lower}: {e}")
 
-        link = f"https://drive.google.com/drive/folders/{brand_id}"
-        brand_links[brand_lower] = link
-
     return brand_links
 
 # ----------------- THE GUI (with config.txt) -----------------
@@ -544,7 +834,8 @@ class BrandInventoryGUI:
 
     def show_loading(self, message="Processing..."):
         if hasattr(self, "loading_overlay") and self.loading_overlay.winfo_exists():
-            return  # Already shown
+            self.loading_label.config(text=message)  # Already shown: just update the text
+            return
 
         self.loading_overlay = tk.Frame(self.master, bg="#ffffff", bd=2, relief="ridge")
         self.loading_overlay.place(relx=0.25, rely=0.4, relwidth=0.5, relheight=0.2)
@@ -614,6 +905,8 @@ class BrandInventoryGUI:
         Clears the input folder and calls getCatalog.py to fetch new CSVs.
         Shows a loading screen while running.
         """
+        if self._busy():
+            return
         in_dir = self.input_dir_var.get().strip()
 
         if not in_dir or not os.path.isdir(in_dir):
@@ -623,27 +916,35 @@ class BrandInventoryGUI:
             messagebox.showwarning("Warning", "No getCatalog.py found in this directory.")
             return
 
-        # ✅ Show loading screen
+        # ✅ Show loading screen; the scrape itself runs on a worker thread
         self.show_loading("Updating files...")
+        self._job_thread = threading.Thread(
+            target=self._get_files_worker, args=(in_dir,), daemon=True
+        )
+        self._job_thread.start()
 
+    def _get_files_worker(self, in_dir):
         try:
-            # Clear the input folder
-            for file in os.listdir(in_dir):
-                file_path = os.path.join(in_dir, file)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
+            # Clear the input folder (unlinks are I/O-bound, so fan them out)
+            with os.scandir(in_dir) as it:
+                paths = [e.path for e in it if e.is_file(follow_symlinks=False)]
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                list(ex.map(os.remove, paths))
             print(f"[INFO] Cleared files in input folder: {in_dir}")
 
-            # Run getCatalog
-            subprocess.check_call(["python", "getCatalog.py", in_dir])
-            self.hide_loading()
-            messagebox.showinfo("Success", "CSV files fetched from getCatalog.py (after clearing input folder).")
-        except subprocess.CalledProcessError as e:
-            self.hide_loading()
-            messagebox.showerror("Error", f"getCatalog.py failed:\n{e}")
+            # Run getCatalog in this interpreter (no new python + re-imports)
+            import getCatalog
+            try:
+                getCatalog.main([in_dir])
+            except SystemExit as e:
+                if e.code:
+                    raise RuntimeError(f"exit status {e.code}") from e
+            self._ui(self.hide_loading)
+            self._ui(messagebox.showinfo, "Success", "CSV files fetched from getCatalog.py (after clearing input folder).")
         except Exception as e:
-            self.hide_loading()
-            messagebox.showerror("Error", str(e))
+            traceback.print_exc()
+            self._ui(self.hide_loading)
+            self._ui(messagebox.showerror, "Error", f"getCatalog.py failed:\n{e}")
 
     def load_brands(self):
         """
@@ -659,25 +960,14 @@ class BrandInventoryGUI:
         self.brand_listbox.configure(state="normal")
 
         brand_set = set()
-        for fn in os.listdir(in_dir):
-            if fn.lower().endswith(".csv"):
-                path = os.path.join(in_dir, fn)
-                try:
-                    df = pd.read_csv(path, nrows=50000)
-                    if "Brand" in df.columns:
-                        # Convert to lower+strip for consistent matching
-                        new_brands = (
-                            df["Brand"]
-                            .dropna()
-                            .astype(str)
-                            .str.strip()
-                            .str.lower()
-                            .unique()
-                            .tolist()
-                        )
-                        brand_set.update(new_brands)
-                except:
-                    pass
+        for path in list_csv_files(in_dir):
+            try:
+                if not csv_has_column(path, "Brand"):
+                    continue
+                # Only the Brand column, normalized (lower+strip) for consistent matching
+                brand_set.update(read_brand_values(path))
+            except:
+                pass
 
         if not brand_set:
             self.brand_listbox.insert(tk.END, "No brands found.")
@@ -688,6 +978,8 @@ class BrandInventoryGUI:
                 self.brand_listbox.insert(tk.END, b)
 
     def run_process(self):
+        if self._busy():
+            return
         in_dir = self.input_dir_var.get().strip()
         out_dir = self.output_dir_var.get().strip()
         emails = self.emails_var.get().strip()
@@ -715,38 +1007,68 @@ class BrandInventoryGUI:
                 "No brands selected. Will process all brand data from the CSVs."
             )
 
+        # Heavy lifting happens off the Tk thread; UI updates come back via after()
+        self.show_loading("Generating brand reports…")
+        self._job_thread = threading.Thread(
+            target=self._run_process_worker,
+            args=(in_dir, out_dir, emails, selected_brands),
+            daemon=True,
+        )
+        self._job_thread.start()
+
+    def _busy(self):
+        """True (and tells the user) while an Update Files or Run job is still going."""
+        job = getattr(self, "_job_thread", None)
+        if job and job.is_alive():
+            messagebox.showinfo("Busy", "A job is already running – please wait for it to finish.")
+            return True
+        return False
+
+    def _ui(self, fn, *args):
+        """Schedule fn(*args) on the Tk main loop (safe to call from any thread)."""
+        self.master.after(0, lambda: fn(*args))
+
+    def _run_process_worker(self, in_dir, out_dir, emails, selected_brands):
         # 1) For each CSV => generate XLSX (Available + Unavailable)
         all_brand_map = {}
         try:
-            for fname in os.listdir(in_dir):
-                if fname.lower().endswith(".csv"):
-                    path = os.path.join(in_dir, fname)
-                    brand_map = generate_brand_reports(path, out_dir, selected_brands)
+            csv_paths = list_csv_files(in_dir)
+            # One process per CSV – pandas filtering + openpyxl formatting are CPU-bound
+            workers = max(1, min(len(csv_paths), os.cpu_count() or 1))
+            # spawn, not fork: we're on a worker thread beside the running Tk loop
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as ex:
+                futures = [ex.submit(generate_brand_reports, p, out_dir, selected_brands)
+                           for p in csv_paths]
+                for fut in as_completed(futures):
                     # Merge
-                    for b_name, xlsx_list in brand_map.items():
+                    for b_name, xlsx_list in fut.result().items():
                         if b_name not in all_brand_map:
                             all_brand_map[b_name] = []
                         all_brand_map[b_name].extend(xlsx_list)
 
             if not all_brand_map:
-                messagebox.showinfo("Done", "No XLSX files generated (possibly no matching data).")
+                self._ui(self.hide_loading)
+                self._ui(messagebox.showinfo, "Done", "No XLSX files generated (possibly no matching data).")
                 return
 
             # 2) Upload to Drive => get brand folder links
             print("[DEBUG] Starting Drive upload...")
-            self.show_loading("Uploading to Google Drive and sending email…")
+            self._ui(self.show_loading, "Uploading to Google Drive and sending email…")
 
             tokens_dir = os.path.join(out_dir, "tokens")
             brand_links = upload_brand_reports_to_drive(all_brand_map, tokens_dir)
             if not brand_links:
-                messagebox.showerror("Error", "No folders created on Drive. Aborting email.")
+                self._ui(self.hide_loading)
+                self._ui(messagebox.showerror, "Error", "No folders created on Drive. Aborting email.")
                 return
 
             # 3) Send an email with each brand link
+            # brand names come straight from the CSVs: escape before they hit HTML
             lines = []
             for brand_lower, link in brand_links.items():
-                lines.append(f"<h3>{brand_lower}</h3>")
-                lines.append(f"<p><a href='{link}'>{link}</a></p>")
+                lines.append(f"<h3>{html.escape(brand_lower)}</h3>")
+                lines.append(f"<p><a href='{html.escape(link, quote=True)}'>{html.escape(link)}</a></p>")
 
             joined = "\n".join(lines)
             body_html = f"""
@@ -766,11 +1088,12 @@ class BrandInventoryGUI:
 
             # 4) Save the chosen input/output folders to config.txt for next run
             save_config(in_dir, out_dir)
-            self.hide_loading()
-            messagebox.showinfo("Success", "All done! Folders uploaded & email sent.")
+            self._ui(self.hide_loading)
+            self._ui(messagebox.showinfo, "Success", "All done! Folders uploaded & email sent.")
         except Exception as e:
             traceback.print_exc()
-            messagebox.showerror("Error", f"An error occurred:\n{e}")
+            self._ui(self.hide_loading)
+            self._ui(messagebox.showerror, "Error", f"An error occurred:\n{e}")
 
 
 # ----------------- MAIN -----------------
@@ -4,9 +4,12 @@ getCatalog.py (single‑store version)
 
 • With --list-stores          → prints JSON list of store keys
 • With STORE_NAME/STORE_ABBR  → downloads *one* store’s CSV
+• run(...)                    → same single‑store download, in‑process
+
+CHROMEDRIVER_PATH=/usr/local/bin/chromedriver skips webdriver‑manager entirely.
 """
 
-import argparse, json, os, sys, time
+import argparse, atexit, hashlib, json, os, re, subprocess, sys, threading, time
 from datetime import datetime
 from pathlib import Path
 from selenium import webdriver
@@ -18,90 +21,272 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+try:                                  # POSIX: lock persistent Chrome profiles
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:                                  # Linux: block on inotify instead of polling
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
 # ─── CLI args ────────────────────────────────────────────
-def cli():
+def cli(argv=None):
     p = argparse.ArgumentParser()
     p.add_argument("download_folder", help="Folder for CSVs")
     p.add_argument("--username", required=True)
     p.add_argument("--password", required=True)
     p.add_argument("--list-stores", action="store_true")
-    return p.parse_args()
+    return p.parse_args(argv)
 
 # ─── Setup browser ───────────────────────────────────────
-def launch_browser(download_dir):
+# chromedriver resolved once per Chrome major version, remembered across runs
+DRIVER_CACHE_FILE = Path.home() / ".cache" / "stashhub" / "chromedriver_path"
+_DRIVER_PATH = None
+_DRIVER_LOCK = threading.Lock()
+
+def chrome_major_version():
+    for exe in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser"):
+        try:
+            out = subprocess.check_output([exe, "--version"], text=True,
+                                          stderr=subprocess.DEVNULL, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            continue
+        m = re.search(r"(\d+)\.", out)
+        if m:
+            return m.group(1)
+    return None
+
+def chromedriver_path():
+    """
+    CHROMEDRIVER_PATH (a pinned binary, e.g. in containers) if set, else the
+    cached path; ChromeDriverManager only runs on a cache miss. A pinned path
+    that doesn't exist is an error – no silent fallback to a network download.
+    """
+    global _DRIVER_PATH
+    pinned = os.getenv("CHROMEDRIVER_PATH")
+    if pinned:
+        if not os.path.isfile(pinned):
+            raise FileNotFoundError(f"CHROMEDRIVER_PATH points to a missing file: {pinned}")
+        return pinned
+    with _DRIVER_LOCK:
+        if _DRIVER_PATH:
+            return _DRIVER_PATH
+        major = chrome_major_version()
+        try:
+            cached = json.loads(DRIVER_CACHE_FILE.read_text())
+        except (OSError, ValueError):
+            cached = {}
+        path = cached.get("path")
+        if not (major and cached.get("chrome") == major and path and os.path.exists(path)):
+            path = ChromeDriverManager().install()
+            if major:
+                try:
+                    DRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                    DRIVER_CACHE_FILE.write_text(json.dumps({"chrome": major, "path": path}))
+                except OSError:
+                    pass
+        _DRIVER_PATH = path
+        return path
+
+# Persistent per-user profiles keep the session cookie between launches, so
+# login() can skip the auth form. One profile per concurrent browser; each is
+# held with flock for the browser's lifetime.
+PROFILE_ROOT = Path.home() / ".cache" / "stashhub"
+MAX_PROFILES = 8
+
+def acquire_profile(user):
+    """Lock a free persistent profile for *user*: (profile_dir, lock_file) or (None, None)."""
+    if fcntl is None or not user:
+        return None, None
+    tag = hashlib.sha1(user.encode("utf-8")).hexdigest()[:12]
+    PROFILE_ROOT.mkdir(parents=True, exist_ok=True)
+    for n in range(MAX_PROFILES):
+        lock = open(PROFILE_ROOT / f"chrome-profile-{tag}-{n}.lock", "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            continue
+        return PROFILE_ROOT / f"chrome-profile-{tag}-{n}", lock
+    return None, None                 # all busy: throwaway profile
+
+def launch_browser(download_dir, user=None):
     os.makedirs(download_dir, exist_ok=True)
     opts = Options()
+    profile, lock = acquire_profile(user)
+    if profile:
+        opts.add_argument(f"--user-data-dir={profile}")
     opts.add_argument("--window-size=1920,1080")
     opts.add_argument("start-maximized")
     opts.add_argument("--headless=new")
+    # Only form controls + the Export menu matter: don't wait for or fetch images
+    opts.page_load_strategy = "eager"
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--no-sandbox")
     opts.add_experimental_option('excludeSwitches', ['enable-logging'])
     opts.add_experimental_option("prefs", {
         "download.default_directory": download_dir,
         "download.prompt_for_download": False,
         "download.directory_upgrade": True,
         "safebrowsing.enabled": True,
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
     })
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    try:
+        driver = webdriver.Chrome(service=Service(chromedriver_path()), options=opts)
+    except Exception:
+        if lock:
+            lock.close()
+        raise
+    driver.profile_lock = lock
+    return driver
+
+def quit_browser(driver):
+    """Quit Chrome, then release its persistent profile (if any)."""
+    try:
+        driver.quit()
+    finally:
+        lock = getattr(driver, "profile_lock", None)
+        if lock:
+            lock.close()
 
 # ─── Selenium actions ─────────────────────────────────────
+HEADER_LOCATION_CSS   = "div[data-testid='header_select_location']"
+USERNAME_CSS          = "input[data-testid='auth_input_username']"
+STORE_ITEM_CSS        = "li[data-testid^='rebrand-header_menu-item_']"
+ACTIONS_BUTTON_CSS    = "#actions-menu-button"
+
+# One execute_script round-trip each, instead of a WebDriver call per element/step
+STORE_KEYS_JS = """
+return Array.from(document.querySelectorAll(arguments[0]))
+            .map(e => e.dataset.testid.split('_').slice(1).join('_'));
+"""
+JS_CLICK = """
+const e = document.querySelector(arguments[0]);
+if (!e || e.disabled || e.getClientRects().length === 0) return false;
+e.scrollIntoView({block: 'center'});
+e.click();
+return true;
+"""
+CURRENT_STORE_JS = """
+const e = document.querySelector(arguments[0]);
+return e ? e.innerText : null;
+"""
+CLICK_STORE_JS = """
+const li = Array.from(document.querySelectorAll(arguments[0]))
+                .find(e => e.innerText.trim() === arguments[1]);
+if (!li) return false;
+li.scrollIntoView({block: 'center'});
+li.click();
+return true;
+"""
+
+def js_click(driver, css, timeout=10):
+    """Wait for + scroll to + click *css* in one execute_script per poll."""
+    WebDriverWait(driver, timeout).until(lambda d: d.execute_script(JS_CLICK, css))
+
 def login(driver, user, pw):
     driver.get("https://dusk.backoffice.dutchie.com/products/catalog")
     wait = WebDriverWait(driver, 10)
-    wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[data-testid='auth_input_username']"))).send_keys(user)
+    # A persistent profile may still be signed in: whichever renders first wins
+    first = wait.until(EC.any_of(
+        EC.presence_of_element_located((By.CSS_SELECTOR, HEADER_LOCATION_CSS)),
+        EC.element_to_be_clickable((By.CSS_SELECTOR, USERNAME_CSS)),
+    ))
+    if first.get_attribute("data-testid") == "header_select_location":
+        return
+    first.send_keys(user)
     wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[data-testid='auth_input_password']"))).send_keys(pw)
-    wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='auth_button_go-green']"))).click()
-    time.sleep(2)
+    js_click(driver, "button[data-testid='auth_button_go-green']")
+    # logged in once the location picker is in the header
+    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, HEADER_LOCATION_CSS)))
 
 def open_store_dropdown(driver):
     try:
         wait = WebDriverWait(driver, 10)
-        dd = wait.until(EC.element_to_be_clickable((By.XPATH, "//div[@data-testid='header_select_location']")))
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", dd)
-        dd.click()
-        time.sleep(1)
+        # native click (scrolls into view itself): the picker may open on mousedown
+        wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, HEADER_LOCATION_CSS))).click()
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, STORE_ITEM_CSS)))
     except TimeoutException:
         print("⚠️  Could not open store dropdown")
 
 def list_store_keys(driver):
     open_store_dropdown(driver)
-    items = driver.find_elements(By.CSS_SELECTOR, "li[data-testid^='rebrand-header_menu-item_']")
-    return [i.get_attribute("data-testid").split("_", 1)[1] for i in items]
+    return driver.execute_script(STORE_KEYS_JS, STORE_ITEM_CSS)
+
+def store_shown(driver, store_name):
+    """True once the header location picker mentions *store_name* anywhere in its text."""
+    text = driver.execute_script(CURRENT_STORE_JS, HEADER_LOCATION_CSS)
+    return store_name in (text or "")
 
-def select_store(driver, store_name):
+def select_store(driver, store_name, timeout=15):
+    if store_shown(driver, store_name):   # warm/persistent session: nothing to switch
+        print(f"✅ Store already selected: {store_name}", flush=True)
+        return
     open_store_dropdown(driver)
     try:
-        wait = WebDriverWait(driver, 10)
-        # Find <li> where .text matches the visible name
-        options = driver.find_elements(By.CSS_SELECTOR, "li[data-testid^='rebrand-header_menu-item_']")
-        for option in options:
-            if option.text.strip() == store_name:
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", option)
-                driver.execute_script("arguments[0].click();", option)
-                print(f"✅ Selected store: {store_name}", flush=True)
-                time.sleep(2)
-                return
-        raise TimeoutException(f"No matching <li> for: {store_name}")
+        # Find + click the <li> whose visible text matches, in the page itself
+        if not driver.execute_script(CLICK_STORE_JS, STORE_ITEM_CSS, store_name):
+            raise TimeoutException(f"No matching <li> for: {store_name}")
+        # done only once the header names the new store – never export the old grid
+        WebDriverWait(driver, timeout).until(lambda d: store_shown(d, store_name))
+        print(f"✅ Selected store: {store_name}", flush=True)
     except Exception as e:
         print(f"❌ Store selection failed: {e}", file=sys.stderr)
         raise
 
+PARTIAL_SUFFIXES = (".crdownload", ".tmp")   # Chrome's in‑progress download names
+
+def _file_names(folder):
+    with os.scandir(folder) as it:
+        return [e.name for e in it if e.is_file()]
+
+def _new_download(names, before):
+    for n in names:
+        if n not in before and not n.endswith(PARTIAL_SUFFIXES):
+            return n
+    return None
+
 def wait_for_new_file(folder, before, timeout=60):
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        diff = set(os.listdir(folder)) - before
-        if diff:
-            return diff.pop()
+    deadline = time.monotonic() + timeout
+    if INotify is not None:
+        with INotify() as ino:
+            ino.add_watch(folder, flags.CLOSE_WRITE | flags.MOVED_TO)
+            # the download may have landed before the watch was in place
+            hit = _new_download(_file_names(folder), before)
+            while not hit:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                hit = _new_download((ev.name for ev in ino.read(timeout=int(remaining * 1000))), before)
+            return hit
+
+    while time.monotonic() < deadline:
+        hit = _new_download(_file_names(folder), before)
+        if hit:
+            return hit
         time.sleep(1)
     return None
 
+def wait_for_catalog(driver, timeout=10):
+    """Block until the catalog's Actions button is usable (it renders with the grid)."""
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, ACTIONS_BUTTON_CSS)))
+    except TimeoutException:
+        print(f"⚠️  Catalog not ready after {timeout}s; trying Actions anyway", flush=True)
+
 def export_csv(driver, folder, abbr):
-    time.sleep(6)  # Let catalog settle
-    wait = WebDriverWait(driver, 10)
-    before = set(os.listdir(folder))
+    wait_for_catalog(driver)
+    before = set(_file_names(folder))
 
-    wait.until(EC.element_to_be_clickable((By.ID, "actions-menu-button"))).click()
-    wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "li[data-testid='catalog-list-actions-menu-item-export']"))).click()
-    wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='export-table-modal-export-csv-button']"))).click()
+    js_click(driver, ACTIONS_BUTTON_CSS)
+    js_click(driver, "li[data-testid='catalog-list-actions-menu-item-export']")
+    js_click(driver, "[data-testid='export-table-modal-export-csv-button']")
 
     fname = wait_for_new_file(folder, before)
     if not fname:
@@ -112,34 +297,114 @@ def export_csv(driver, folder, abbr):
     Path(folder, fname).rename(Path(folder, new_name))
     print(f"✅ CSV saved → {new_name}")
 
-# ─── Main ─────────────────────────────────────────────────
-def main():
-    args = cli()
-    folder = args.download_folder
-    user   = args.username
-    pw     = args.password
+# ─── Warm browser pool ───────────────────────────────────
+# Logged‑in browsers are parked after a successful run and handed to the next
+# run() for the same user (download dir retargeted over CDP), so a long‑lived
+# process skips Chrome start‑up + login. Idle ones are quit after BROWSER_IDLE_S.
+BROWSER_IDLE_S = 300
+_IDLE = {}                            # user -> [(driver, parked_at), …]
+_IDLE_LOCK = threading.Lock()
+REAP_INTERVAL_S = 30
+_REAPER = None                        # the one reaper thread, while browsers are parked
 
-    store_name = os.getenv("STORE_NAME")
-    store_abbr = os.getenv("STORE_ABBR")
+def _reap_idle_browsers(max_idle=None):
+    max_idle = BROWSER_IDLE_S if max_idle is None else max_idle
+    now, stale = time.monotonic(), []
+    with _IDLE_LOCK:
+        for user, parked in list(_IDLE.items()):
+            keep = [(d, t) for d, t in parked if now - t < max_idle]
+            stale += [d for d, t in parked if now - t >= max_idle]
+            if keep:
+                _IDLE[user] = keep
+            else:
+                del _IDLE[user]
+    for d in stale:
+        try:
+            quit_browser(d)
+        except Exception:
+            pass
 
-    driver = launch_browser(folder)
+atexit.register(_reap_idle_browsers, 0)
 
-    try:
-        login(driver, user, pw)
+def checkout_browser(download_dir, user):
+    """A parked browser for *user* pointed at *download_dir*, else a new one."""
+    _reap_idle_browsers()
+    while True:
+        with _IDLE_LOCK:
+            parked = _IDLE.get(user)
+            driver = parked.pop()[0] if parked else None
+        if driver is None:
+            return launch_browser(download_dir, user)
+        try:
+            os.makedirs(download_dir, exist_ok=True)
+            driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow", "downloadPath": os.path.abspath(download_dir),
+            })
+            return driver
+        except Exception:             # browser died while parked
+            try:
+                quit_browser(driver)
+            except Exception:
+                pass
 
-        if args.list_stores:
-            print(json.dumps(list_store_keys(driver)))
-            return
+def _reaper_loop():
+    """Single background reaper; exits once nothing is parked."""
+    global _REAPER
+    while True:
+        time.sleep(REAP_INTERVAL_S)
+        _reap_idle_browsers()
+        with _IDLE_LOCK:
+            if not _IDLE:
+                _REAPER = None
+                return
 
-        if not (store_name and store_abbr):
-            print("❌ STORE_NAME and STORE_ABBR must be set in env", file=sys.stderr)
-            sys.exit(1)
+def checkin_browser(driver, user):
+    global _REAPER
+    with _IDLE_LOCK:
+        _IDLE.setdefault(user, []).append((driver, time.monotonic()))
+        if _REAPER is None:
+            _REAPER = threading.Thread(target=_reaper_loop, name="browser-reaper", daemon=True)
+            _REAPER.start()
 
+# ─── Single‑store entry (in‑process) ─────────────────────
+def run(download_folder, username, password, store_name, store_abbr) -> bool:
+    """Download *store_name*'s catalog CSV into *download_folder*; True on success."""
+    driver = checkout_browser(download_folder, username)
+    try:
+        login(driver, username, password)
         select_store(driver, store_name)
-        export_csv(driver, folder, store_abbr)
+        export_csv(driver, download_folder, store_abbr)
+    except Exception as e:
+        print(f"❌ {store_name}: {e}", file=sys.stderr)
+        quit_browser(driver)          # unknown page state: don't reuse
+        return False
+    checkin_browser(driver, username)
+    return True
 
-    finally:
-        driver.quit()
+# ─── Main ─────────────────────────────────────────────────
+def main(argv=None):
+    args = cli(argv)
+    folder = args.download_folder
+    user   = args.username
+    pw     = args.password
+
+    if args.list_stores:
+        driver = launch_browser(folder, user)
+        try:
+            login(driver, user, pw)
+            print(json.dumps(list_store_keys(driver)))
+        finally:
+            quit_browser(driver)
+        return
+
+    store_name = os.getenv("STORE_NAME")
+    store_abbr = os.getenv("STORE_ABBR")
+    if not (store_name and store_abbr):
+        print("❌ STORE_NAME and STORE_ABBR must be set in env", file=sys.stderr)
+        sys.exit(1)
+
+    if not run(folder, user, pw, store_name, store_abbr):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
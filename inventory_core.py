@@ -2,34 +2,83 @@
 Core helpers shared by both the GUI and Flask versions.
 """
 
-import subprocess, sys, os,json
+import subprocess, sys, os,json, threading, logging
 import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill
 from datetime import datetime
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable
+from html import escape
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 
+try:
+    import orjson                   # optional: faster stores.json parsing
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("inventory‑core")
+
 # ---------------------------------------------------------------------------
 # get_catalog() – wraps your Selenium script
 # ---------------------------------------------------------------------------
 STORE_FILE = os.path.join(os.path.dirname(__file__), "stores.json")
 
+# Parsed stores.json, re-read only when its (mtime_ns, size) changes
+_STORE_CACHE: dict = {}
+_STORE_LOCK = threading.Lock()
+
 def load_store_map():
-    if os.path.exists(STORE_FILE):
-        with open(STORE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}  # empty until user configures
+    try:
+        st = os.stat(STORE_FILE)
+    except FileNotFoundError:
+        return {}  # empty until user configures
+    sig = (st.st_mtime_ns, st.st_size)
+    with _STORE_LOCK:
+        if _STORE_CACHE.get("sig") == sig:
+            return dict(_STORE_CACHE["map"])
+    with open(STORE_FILE, "rb") as f:
+        raw = f.read()
+    m = orjson.loads(raw) if orjson else json.loads(raw.decode("utf-8"))
+    with _STORE_LOCK:
+        _STORE_CACHE.update(sig=sig, map=m)
+    return dict(m)
 
 def save_store_map(m):
-    with open(STORE_FILE, "w", encoding="utf-8") as f:
-        json.dump(m, f, indent=2, ensure_ascii=False)
+    if orjson:
+        data = orjson.dumps(m, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(m, indent=2, ensure_ascii=False).encode("utf-8")
+    with open(STORE_FILE, "wb") as f:
+        f.write(data)
+    st = os.stat(STORE_FILE)
+    with _STORE_LOCK:
+        _STORE_CACHE.update(sig=(st.st_mtime_ns, st.st_size), map=dict(m))
 def get_catalog(dest_folder: str) -> dict:
+    # Run getCatalog in this interpreter (selenium & co. imported once per
+    # process); CATALOG_SUBPROCESS=1 keeps the old isolated child process.
+    if os.getenv("CATALOG_SUBPROCESS") != "1":
+        try:
+            import getCatalog
+        except ImportError as e:
+            log.debug("get_catalog: in-process import failed (%s); using subprocess", e)
+        else:
+            try:
+                getCatalog.main([dest_folder])
+            except SystemExit as e:
+                if e.code:
+                    return {"ok": False, "msg": f"getCatalog.py failed: exit status {e.code}"}
+            except Exception as e:
+                log.exception("get_catalog failed")
+                return {"ok": False, "msg": f"getCatalog.py failed: {e}"}
+            return {"ok": True, "msg": "Catalog downloaded"}
+
     # compute path to getCatalog.py
     script_path = os.path.abspath(
         os.path.join(os.path.dirname(__file__), "getCatalog.py")
     )
     # DEBUG!
-    print(f"[DEBUG] get_catalog: script_path={script_path}, cwd={os.getcwd()!r}")
+    log.debug("get_catalog: script_path=%s, cwd=%r", script_path, os.getcwd())
     if not os.path.exists(script_path):
         return {"ok": False, "msg": f"getCatalog.py not found at {script_path}"}
 
@@ -46,62 +95,86 @@ def get_catalog(dest_folder: str) -> dict:
 # ---------------------------------------------------------------------------
 # scan_brands() – collects unique brands from CSVs
 # ---------------------------------------------------------------------------
+def _file_brands(path: str) -> set:
+    """Unique lowercased/stripped Brand values of one CSV (empty set on error)."""
+    try:
+        import pyarrow.compute as pc
+        from pyarrow import csv as pacsv
+        # Arrow's multithreaded parser, Brand column only, no DataFrame
+        tbl = pacsv.read_csv(path, convert_options=pacsv.ConvertOptions(
+            include_columns=["Brand"], strings_can_be_null=True))
+        col = pc.cast(tbl["Brand"], "string").drop_null()
+        return set(pc.unique(pc.utf8_lower(pc.utf8_trim_whitespace(col))).to_pylist())
+    except (ImportError, ValueError):   # no pyarrow, or rows it won't parse
+        pass
+    except Exception:
+        return set()
+    try:
+        df = pd.read_csv(path, usecols=["Brand"])
+        return set(df["Brand"].dropna().astype(str).str.strip().str.lower().unique())
+    except Exception:
+        return set()
+
 def scan_brands(csv_dir: str) -> list[str]:
+    with os.scandir(csv_dir) as it:
+        paths = [e.path for e in it if e.is_file() and e.name.lower().endswith(".csv")]
     brands = set()
-    for fn in os.listdir(csv_dir):
-        if fn.lower().endswith(".csv"):
-            try:
-                df = pd.read_csv(os.path.join(csv_dir, fn), usecols=["Brand"])
-                brands.update(df["Brand"].dropna().astype(str).str.strip().str.lower().unique())
-            except Exception:
-                pass
+    with ThreadPoolExecutor(max_workers=min(8, len(paths) or 1)) as ex:
+        for found in ex.map(_file_brands, paths):
+            brands.update(found)
     return sorted(brands)
 
 # ---------------------------------------------------------------------------
 # run_full_pipeline() – XLSX gen, Drive upload, email
 # ---------------------------------------------------------------------------
-from pathlib import Path      
-def write_status(path: Path, txt: str):
-    path.write_text(txt, encoding="utf-8")
-
-def run_full_pipeline(csv_dir: str,
-                      output_dir: str,
-                      selected_brands: list[str],
-                      emails: str,
-                      tokens_dir: str,
-                      status_file: Path) -> dict:
+@lru_cache(maxsize=1)
+def _report_helpers():
+    """Report/Drive/Gmail helpers, resolved once (the GUI module pulls in tkinter + Google APIs)."""
     from brand_inventory_gui_code import (
         generate_brand_reports,
         upload_brand_reports_to_drive,
         send_email_with_gmail_html,
         save_config,
     )
-    import inspect, sys
-    print(">>> using function from:", upload_brand_reports_to_drive.__module__, 
-        " @ ", sys.modules[upload_brand_reports_to_drive.__module__].__file__)
-    print(">>> signature:", inspect.signature(upload_brand_reports_to_drive))
-    all_brand_map = {}
-    write_status(status_file, "⏳ Generating brand XLSX files…")
-    for file in os.listdir(csv_dir):
-        if file.lower().endswith(".csv"):
-            brand_map = generate_brand_reports(
-                os.path.join(csv_dir, file), output_dir, selected_brands
-            )
+    return generate_brand_reports, upload_brand_reports_to_drive, send_email_with_gmail_html, save_config
+
+def run_full_pipeline(csv_dir: str,
+                      output_dir: str,
+                      selected_brands: list[str],
+                      emails: str,
+                      tokens_dir: str,
+                      report_status: Callable[[str], None]) -> dict:
+    """report_status(txt) publishes a progress line (app.py: its write_status)."""
+    (generate_brand_reports, upload_brand_reports_to_drive,
+     send_email_with_gmail_html, save_config) = _report_helpers()
+    all_brand_map = defaultdict(list)
+    report_status("⏳ Generating brand XLSX files…")
+    with os.scandir(csv_dir) as it:
+        csv_paths = [e.path for e in it if e.is_file() and e.name.lower().endswith(".csv")]
+    # One thread per CSV; map() keeps file order so the email lists brands stably
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+        for brand_map in ex.map(
+            lambda p: generate_brand_reports(p, output_dir, selected_brands), csv_paths
+        ):
             for k, v in brand_map.items():
-                all_brand_map.setdefault(k, []).extend(v)
+                all_brand_map[k].extend(v)
 
     if not all_brand_map:
         return {"ok": False, "msg": "No XLSX generated–check filters/CSVs."}
-    print("upload_brand_reports_to_drive")
-    write_status(status_file, "⏳ Uploading to Google Drive…")
+    log.info("⏫ Uploading %d brand(s) to Drive", len(all_brand_map))
+    report_status("⏳ Uploading to Google Drive…")
     links = upload_brand_reports_to_drive(all_brand_map, tokens_dir)
     if not links:
         return {"ok": False, "msg": "Drive upload failed."}
 
-    body = "".join(f"<h3>{b}</h3><p><a href='{url}'>{url}</a></p>" for b, url in links.items())
+    # brand names come straight from the CSVs: escape before they hit HTML
+    body = "".join([
+        f"<h3>{escape(b)}</h3><p><a href='{escape(url, quote=True)}'>{escape(url)}</a></p>"
+        for b, url in links.items()
+    ])
     html = f"<html><body><p>Hello,</p>{body}<p>– Brand Inventory Bot</p></body></html>"
-    write_status(status_file, "⏳ Sending email…")
+    report_status("⏳ Sending email…")
     send_email_with_gmail_html("Brand Inventory Drive Links", html, emails, tokens_dir)
     save_config(csv_dir, output_dir)
-    write_status(status_file, "✅ Pipeline complete – email sent!")
+    report_status("✅ Pipeline complete – email sent!")
     return {"ok": True, "msg": "Pipeline finished & email sent."}
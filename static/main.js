@@ -50,11 +50,21 @@ async function loadBrands() {
   }
 }
 
-/* ────── poll /status every 2 s until ✅ or ❌, then refresh UI ───── */
-async function pollStatusAndLoadBrands() {
+/* ── long‑poll /status (server holds until it changes) until ✅ or ❌ ── */
+async function pollStatusAndLoadBrands(since = '') {
   let last = '';
   while (true) {
-    const res = await fetch('/status');
+    const res = await fetch(`/status?since=${encodeURIComponent(since)}`);
+    since = res.headers.get('X-Status-Version') || since;
+    if (res.status === 204) {                    /* timed out, nothing new */
+      const retry = Number(res.headers.get('Retry-After'));   /* server at its poll cap */
+      if (retry) await new Promise(r => setTimeout(r, retry * 1000));
+      continue;
+    }
+    if (!res.ok) {                               /* back off on errors   */
+      await new Promise(r => setTimeout(r, 2000));
+      continue;
+    }
     const txt = await res.text();
 
     if (txt !== last) {               /* new line => show it */
@@ -67,7 +77,6 @@ async function pollStatusAndLoadBrands() {
       if (txt.startsWith('✅')) await loadBrands();  /* refresh brand list */
       break;
     }
-    await new Promise(r => setTimeout(r, 2000));
   }
 }
 
@@ -109,8 +118,8 @@ document.addEventListener('DOMContentLoaded', () => {
         showStatus(`❌ Catalog scrape failed: ${json.msg || ''}`, true);
         return;
       }
-      /* start polling; when finished loadBrands() will run */
-      await pollStatusAndLoadBrands();
+      /* start polling from the "Queued" write, so the last run's ✅ isn't replayed */
+      await pollStatusAndLoadBrands(res.headers.get('X-Status-Version') || '');
     } catch (err) {
       hideLoading();
       showStatus(`❌ Network error: ${err.message}`, true);
@@ -163,8 +172,8 @@ document.addEventListener('DOMContentLoaded', () => {
         return;
       }
 
-      /* start live polling */
-      await pollStatusAndLoadBrands();
+      /* start live polling from the "Queued" write */
+      await pollStatusAndLoadBrands(res.headers.get('X-Status-Version') || '');
       /* runButton re‑enabled by poll loop */
     } catch (err) {
       hideLoading();
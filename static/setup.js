@@ -6,13 +6,17 @@ document.addEventListener("DOMContentLoaded", () => {
   
     const addRow = (n = "", a = "") => {
       const tr = document.createElement("tr");
-      tr.innerHTML = `<td><input value="${n}"></td>
-                      <td><input value="${a}"></td>
+      tr.innerHTML = `<td><input></td>
+                      <td><input></td>
                       <td><button class="del">✕</button></td>`;
+      const [nameIn, abbrIn] = tr.querySelectorAll("input");
+      nameIn.value = n;
+      abbrIn.value = a;
       tbody.appendChild(tr);
       tr.querySelector(".del").onclick = () => tr.remove();
     };
     addRowBtn.onclick = () => addRow();
+    Object.entries(CFG.store_map || {}).forEach(([n, a]) => addRow(n, a));
   
     saveBtn.onclick = async () => {
       msg.textContent = "";
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Production entry points for the Brand‑Inventory Flask app.
+
+WSGI (recommended)
+    gunicorn -w 1 -k gthread --threads 16 -b 0.0.0.0:5000 wsgi:application
+
+ASGI (needs asgiref + uvicorn)
+    uvicorn wsgi:asgi_app --host 0.0.0.0 --port 5000
+
+Put nginx in front (deploy/nginx.conf) so /static/ is sent straight from disk.
+
+Containers with a baked‑in chromedriver should set
+    CHROMEDRIVER_PATH=/usr/local/bin/chromedriver
+so the scraper never calls out to webdriver‑manager.
+
+/status?since= long‑polls hold a thread for up to 25 s; app.STATUS_LONGPOLL_MAX
+(8) caps how many may wait at once – beyond that they get an immediate 204 +
+Retry‑After – so at least 8 of the 16 threads stay free for other routes.
+Raise --threads together with that cap for more concurrent tabs.
+
+Job tracking (one scrape/pipeline per user), the job pools and the
+parsed‑JSON / brands caches live in‑process, so scale with threads rather
+than extra workers.
+"""
+
+from app import APP as application
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    asgi_app = WsgiToAsgi(application)
+except ImportError:          # ASGI is optional
+    asgi_app = None